@@ -0,0 +1,89 @@
+"""
+Hot loops for parsing and matching segments.
+
+This module is kept fully typed and free of dynamic features so it can be compiled
+with mypyc (``mypyc x12tools/_fast.py``). A compiled extension takes precedence over
+this file on import; without one, the pure Python version is used.
+"""
+
+import sys
+from typing import Callable, Sequence, TypeVar
+
+Matcher = Callable[[str], object]
+SegmentT = TypeVar("SegmentT", bound=Sequence[str])
+
+
+def split_segments(content: str, segment_terminator: str) -> list[str]:
+    """
+    Splits content into raw segment strings, dropping the trailing empty shard.
+
+    Segments are only stripped when the content has whitespace that str.strip would
+    remove from a segment: non-printable characters, or spaces next to a terminator.
+    """
+    segments: list[str] = content.split(segment_terminator)
+    if segments[-1] == "":
+        segments.pop()
+    strip = (
+        not content.isprintable()
+        or f"{segment_terminator} " in content
+        or f" {segment_terminator}" in content
+    )
+    if strip:
+        segments = [segment.strip() for segment in segments]
+    return segments
+
+
+def split_elements(content: str, element_separator: str) -> list[str]:
+    """
+    Splits a segment string into elements.
+    """
+    return content.split(element_separator)
+
+
+def matches(segment: Sequence[str], checks: list[tuple[int, Matcher]]) -> bool:
+    """
+    Returns True if every matcher accepts the element at its index.
+    """
+    for idx, matcher in checks:
+        if not matcher(segment[idx]):
+            return False
+    return True
+
+
+def filter_segments(
+    segments: list[SegmentT], checks: list[tuple[int, Matcher]]
+) -> list[tuple[int, SegmentT]]:
+    """
+    Returns the (index, segment) pairs accepted by matches.
+    """
+    return [
+        (idx, segment)
+        for idx, segment in enumerate(segments)
+        if matches(segment, checks)
+    ]
+
+
+def split_identifiers(raw_segments: list[str], element_separator: str) -> list[str]:
+    """
+    Returns the (interned) identifier of each raw segment string.
+    """
+    return [sys.intern(raw.partition(element_separator)[0]) for raw in raw_segments]
+
+
+def split_identifiers_bytes(
+    raw_segments: list[bytes], element_separator: bytes
+) -> list[str]:
+    """
+    Returns the (interned) identifier of each raw ASCII bytes segment.
+    """
+    return [
+        sys.intern(raw.partition(element_separator)[0].decode("ascii"))
+        for raw in raw_segments
+    ]
+
+
+def match_indexes(values: list[str], matcher: Matcher) -> list[int]:
+    """
+    Returns the indexes of the values the matcher accepts.
+    """
+    return [idx for idx, value in enumerate(values) if matcher(value)]
@@ -1,10 +1,50 @@
+import mmap
 from pathlib import Path
-from typing import Type, Self, Optional
-from dataclasses import dataclass
-
-from .segment import X12Segment
+from typing import Callable, Type, Self, Optional
+from dataclasses import dataclass, field
+
+from . import _fast
+from .segment import (
+    X12Segment,
+    _UnparsedByteSegments,
+    _UnparsedSegments,
+    _UnparsedStrSegments,
+    _matcher,
+)
 from .constants import ELEMENT_SEPARATOR_INDEX, SEGMENT_TERMINATOR_INDEX
 
+# The ASCII characters str.strip treats as whitespace, including the \x1c-\x1f
+# separators that bytes.strip keeps, so both loaders strip segments the same way
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+# Compiled filter for transaction set headers and trailers, used by update_se_lengths
+_ST_SE_FILTERS: list[tuple[int, _fast.Matcher]] = [
+    (0, frozenset(("ST", "SE")).__contains__)
+]
+
+
+class _SegmentsField:
+    """
+    Descriptor for X12Document.segments, parsing any unparsed segments on first access.
+    """
+
+    def __get__(
+        self, obj: Optional["X12Document"], objtype: Optional[type] = None
+    ) -> list[X12Segment]:
+        if obj is None:
+            # No class-level default, so dataclass treats segments as required
+            raise AttributeError("segments")
+        # Stored under a private name outside the dataclass fields, so asdict and
+        # fields() only see segments itself
+        if obj._unparsed is not None:
+            vars(obj)["_segments"] = obj._unparsed.materialize()
+            obj._unparsed = None
+        return vars(obj)["_segments"]
+
+    def __set__(self, obj: "X12Document", value: list[X12Segment]) -> None:
+        vars(obj)["_segments"] = value
+        obj._unparsed = None
+
 
 @dataclass
 class X12Document:
@@ -21,10 +61,13 @@ class X12Document:
         The character used to separate data elements (default is "*").
     """
 
-    segments: list[X12Segment]
+    segments: _SegmentsField = _SegmentsField()
     segment_terminator: str = "~"
     element_separator: str = "*"
     file_path: Optional[Path] = None
+    _unparsed: Optional[_UnparsedSegments] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def from_string(cls: Type[Self], content: str) -> Self:
@@ -45,15 +88,14 @@ class X12Document:
         content = content.strip()
         element_separator = content[ELEMENT_SEPARATOR_INDEX]
         segment_terminator = content[SEGMENT_TERMINATOR_INDEX]
-        content = content.removesuffix(segment_terminator)
-        segments = content.split(segment_terminator)
-        segments = [
-            X12Segment.from_string(segment, element_separator) for segment in segments
-        ]
-        return cls(
-            segments=segments,
-            segment_terminator=segment_terminator,
-            element_separator=element_separator,
+        if segment_terminator not in "\r\n":
+            # Drop line breaks after terminators in one pass instead of stripping each
+            content = content.replace(
+                f"{segment_terminator}\r\n", segment_terminator
+            ).replace(f"{segment_terminator}\n", segment_terminator)
+        raw_segments = _fast.split_segments(content, segment_terminator)
+        return cls._from_unparsed(
+            _UnparsedStrSegments(raw_segments, element_separator), segment_terminator
         )
 
     @classmethod
@@ -72,11 +114,84 @@ class X12Document:
             An instance of X12File.
         """
         file_path = Path(file_path)
-        file_content = file_path.read_text()
-        obj = cls.from_string(file_content)
-        obj.file_path = Path(file_path)
+        with open(file_path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                obj = cls.from_buffer(buffer)
+        obj.file_path = file_path
+        return obj
+
+    @classmethod
+    def from_buffer(cls: Type[Self], buffer: bytes | mmap.mmap) -> Self:
+        """
+        Creates an X12File instance from ASCII bytes.
+
+        The buffer is never decoded or copied as a whole, so a memory-mapped file can
+        be parsed without loading it into memory up front. Segments are kept as bytes
+        and only decoded when first accessed.
+
+        Parameters
+        ----------
+        buffer : bytes or mmap.mmap
+            A bytes-like object representing the X12 document.
+
+        Returns
+        -------
+        Self
+            An instance of X12File.
+
+        Raises
+        ------
+        ValueError
+            If the buffer is too short to hold an ISA header.
+        """
+        size = len(buffer)
+        start = 0
+        while start < size and buffer[start] in _ASCII_WHITESPACE:
+            start += 1
+        separator_idx = start + ELEMENT_SEPARATOR_INDEX
+        terminator_idx = start + SEGMENT_TERMINATOR_INDEX
+        element_separator = buffer[separator_idx : separator_idx + 1].decode("ascii")
+        segment_terminator = buffer[terminator_idx : terminator_idx + 1]
+        if len(element_separator) != 1 or len(segment_terminator) != 1:
+            raise ValueError(f"Buffer of {size} bytes is too short for an ISA header")
+        raw_segments = []
+        while start < size:
+            end = buffer.find(segment_terminator, start)
+            if end == -1:
+                end = size
+            segment = buffer[start:end].strip(_ASCII_WHITESPACE)
+            if not segment.isascii():
+                # Fail at load rather than when the segment is first parsed
+                segment.decode("ascii")
+            if segment or end < size:
+                raw_segments.append(segment)
+            start = end + 1
+        return cls._from_unparsed(
+            _UnparsedByteSegments(raw_segments, element_separator),
+            segment_terminator.decode("ascii"),
+        )
+
+    @classmethod
+    def _from_unparsed(
+        cls: Type[Self], unparsed: _UnparsedSegments, segment_terminator: str
+    ) -> Self:
+        """
+        Creates an instance whose segments are split into elements on first access.
+        """
+        obj = cls(
+            segments=[],
+            segment_terminator=segment_terminator,
+            element_separator=unparsed.element_separator,
+        )
+        obj._unparsed = unparsed
         return obj
 
+    def _get_unparsed(self) -> Optional[_UnparsedSegments]:
+        """
+        Returns the pending unparsed segments, or None once segments is populated.
+        """
+        return self._unparsed
+
     def get_segments(
         self, filters: str | list[str] | dict[int, str]
     ) -> list[tuple[int, X12Segment]]:
@@ -100,11 +215,19 @@ class X12Document:
             filters = [filters]
         if isinstance(filters, list):
             filters = dict(enumerate(filters))
-        return [
-            (idx, segment)
-            for idx, segment in enumerate(self.segments)
-            if segment.matches(filters)
-        ]
+        compiled = [(idx, _matcher(value)) for idx, value in filters.items()]
+        return self._get_segments_compiled(compiled)
+
+    def _get_segments_compiled(
+        self, filters: list[tuple[int, Callable[[str], object]]]
+    ) -> list[tuple[int, X12Segment]]:
+        """
+        Returns the segments (with indexes) that match already compiled filters.
+        """
+        unparsed = self._get_unparsed()
+        if unparsed is not None:
+            return unparsed.get_segments(filters)
+        return _fast.filter_segments(self.segments, filters)
 
     def remove(self, filters: str | list[str] | dict[int, str], single=True) -> int:
         """
@@ -120,11 +243,15 @@ class X12Document:
         int
             The number of segments removed.
         """
-        segments = (
-            [self.get_single_segment(filters)] if single else self.get_segments(filters)
-        )
-        for idx, segment in reversed(segments):
-            self.segments.pop(idx)
+        if single:
+            idx, _ = self.get_single_segment(filters)
+            del self.segments[idx]
+            return 1
+        segments = self.get_segments(filters)
+        drop = {idx for idx, _ in segments}
+        self.segments[:] = [
+            segment for idx, segment in enumerate(self.segments) if idx not in drop
+        ]
         return len(segments)
 
     def get_single_segment(
@@ -171,6 +298,9 @@ class X12Document:
             The segment that matches the key.
         """
         if isinstance(key, int):
+            unparsed = self._get_unparsed()
+            if unparsed is not None:
+                return unparsed.parse(range(len(unparsed))[key])
             return self.segments[key]
         return self.get_single_segment(key)[1]
 
@@ -178,9 +308,23 @@ class X12Document:
         """
         Updates transaction set trailers to match the actual number of segments.
         """
-        for st_idx, st in self.get_segments("ST"):
+        headers: list[tuple[int, X12Segment]] = []
+        trailers: dict[str, list[tuple[int, X12Segment]]] = {}
+        envelopes = self._get_segments_compiled(_ST_SE_FILTERS)
+        for idx, segment in envelopes:
+            if segment[0] == "ST":
+                headers.append((idx, segment))
+            else:
+                trailers.setdefault(segment[2], []).append((idx, segment))
+        for st_idx, st in headers:
             control_number = st[2]
-            se_idx, se = self.get_single_segment({0: "SE", 2: control_number})
+            matching = trailers.get(control_number, [])
+            if len(matching) != 1:
+                filters = {0: "SE", 2: control_number}
+                raise KeyError(
+                    f"{len(matching)} segments found for filters {repr(filters)}"
+                )
+            se_idx, se = matching[0]
             se[1] = str(se_idx - st_idx + 1)
 
     def to_string(self, newlines=None) -> str:
@@ -202,9 +346,16 @@ class X12Document:
         segment_delimiter = self.segment_terminator
         if newlines or (newlines is None and "\n" not in segment_delimiter):
             segment_delimiter += "\n"
-        segments = (
-            segment.to_string(self.element_separator) for segment in self.segments
-        )
+        element_separator = self.element_separator
+        # ISA segments (one per interchange) need padding, the rest are joined directly
+        segments = [
+            (
+                segment.to_string_isa(element_separator)
+                if segment[0] == "ISA"
+                else element_separator.join(segment)
+            )
+            for segment in self.segments
+        ]
         return segment_delimiter.join(segments) + segment_delimiter
 
     def to_file(self, file_path: str | Path = None, newlines=None) -> None:
@@ -227,5 +378,6 @@ class X12Document:
         file_path = file_path or self.file_path
         if not file_path:
             raise ValueError("No file_path provided and no original file_path set")
-        file_path = Path(file_path)
-        file_path.write_text(self.to_string(newlines=newlines))
+        content = self.to_string(newlines=newlines)
+        with open(file_path, "w", encoding="ascii") as file:
+            file.write(content)
@@ -1,8 +1,41 @@
+import operator
 import re
-from typing import Type, Self
+from abc import ABC, abstractmethod
+from functools import lru_cache, partial
+from typing import AnyStr, Callable, Generic, Type, Self
 
+from . import _fast
 from .constants import ISA_ELEMENT_LENGTHS
 
+_REGEX_METACHARACTERS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+@lru_cache(maxsize=1024)
+def _compile(pattern: str) -> re.Pattern:
+    """
+    Returns a compiled regex pattern, cached across calls.
+    """
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=1024)
+def _matcher(pattern: str | re.Pattern) -> Callable[[str], object]:
+    """
+    Returns a callable that full-matches a string against the pattern.
+
+    Already compiled patterns are used as they are.
+
+    Patterns without regex metacharacters are compared with plain string equality,
+    avoiding the regex engine for the common identifier-only filters. Unlike
+    re.escape, spaces and other characters that are only special in verbose mode
+    still count as literal, so padded values such as ISA elements take this path.
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern.fullmatch
+    if not _REGEX_METACHARACTERS.search(pattern):
+        return partial(operator.eq, pattern)
+    return _compile(pattern).fullmatch
+
 
 class X12Segment(list[str]):
     """
@@ -27,8 +60,7 @@ class X12Segment(list[str]):
             An instance of X12Segment.
         """
         content = content.strip()
-        return cls(content.split(element_separator))
-
+        return cls(_fast.split_elements(content, element_separator))
 
     def matches(self, filters: dict[int, str]) -> bool:
         """
@@ -45,8 +77,27 @@ class X12Segment(list[str]):
         bool
             True if the segment matches the filters.
         """
-        filter_matches = (re.fullmatch(value, self[idx]) for idx, value in filters.items())
-        return all(filter_matches)
+        compiled = [(idx, _matcher(value)) for idx, value in filters.items()]
+        return self.matches_compiled(compiled)
+
+    def matches_compiled(
+        self, filters: list[tuple[int, Callable[[str], object]]]
+    ) -> bool:
+        """
+        Returns True if the segment matches the already compiled filters.
+
+        Parameters
+        ----------
+        filters : list of tuple of int and callable
+            The filters to apply to the segment, as pairs of element index and
+            matcher (see _matcher).
+
+        Returns
+        -------
+        bool
+            True if the segment matches the filters.
+        """
+        return _fast.matches(self, filters)
 
     def to_string(self, element_separator: str) -> str:
         """
@@ -63,7 +114,158 @@ class X12Segment(list[str]):
             The segment as a string.
         """
         if self[0] == "ISA":
-            for idx, value in enumerate(self):
-                stripped = value.rstrip()
-                self[idx] = stripped.ljust(ISA_ELEMENT_LENGTHS[idx])
+            return self.to_string_isa(element_separator)
+        return self.to_string_plain(element_separator)
+
+    def to_string_plain(self, element_separator: str) -> str:
+        """
+        Returns the segment as a string, without any ISA padding.
+
+        Parameters
+        ----------
+        element_separator : str
+            The character to use to separate data elements.
+
+        Returns
+        -------
+        str
+            The segment as a string.
+        """
         return element_separator.join(self)
+
+    def to_string_isa(self, element_separator: str) -> str:
+        """
+        Returns the segment as a string, padding elements to the fixed ISA lengths.
+
+        The segment itself is left unchanged.
+
+        Parameters
+        ----------
+        element_separator : str
+            The character to use to separate data elements.
+
+        Returns
+        -------
+        str
+            The segment as a string.
+        """
+        padded = (
+            value.rstrip().ljust(ISA_ELEMENT_LENGTHS[idx])
+            for idx, value in enumerate(self)
+        )
+        return element_separator.join(padded)
+
+
+class _UnparsedSegments(ABC, Generic[AnyStr]):
+    """
+    Raw segments that are split into X12Segments only when first accessed.
+
+    Parsed segments are cached by index, so the same X12Segment (and any edits made
+    to it) is returned however it is reached. Identifiers are kept in a flat column
+    alongside the raw strings so identifier-only filters never touch the segments.
+    """
+
+    def __init__(self, raw_segments: list[AnyStr], element_separator: str) -> None:
+        self.raw_segments: list[AnyStr] = raw_segments
+        self.element_separator = element_separator
+        self.parsed: dict[int, X12Segment] = {}
+        self._identifiers: list[str] | None = None
+
+    @property
+    def identifiers(self) -> list[str]:
+        """
+        The identifier of each raw segment, split out on first use.
+        """
+        if self._identifiers is None:
+            self._identifiers = self._split_identifiers()
+        return self._identifiers
+
+    @abstractmethod
+    def _split_identifiers(self) -> list[str]:
+        """
+        Returns the identifier of each raw segment.
+        """
+
+    @abstractmethod
+    def _split(self, raw: AnyStr) -> X12Segment:
+        """
+        Returns a raw segment split into an X12Segment.
+        """
+
+    def __len__(self) -> int:
+        return len(self.raw_segments)
+
+    def parse(self, idx: int) -> X12Segment:
+        """
+        Returns the segment at a (non-negative) index, parsing it if needed.
+        """
+        segment = self.parsed.get(idx)
+        if segment is None:
+            segment = self._split(self.raw_segments[idx])
+            self.parsed[idx] = segment
+        return segment
+
+    def get_segments(
+        self, filters: list[tuple[int, Callable[[str], object]]]
+    ) -> list[tuple[int, X12Segment]]:
+        """
+        Returns the segments (with indexes) that match the compiled filters.
+
+        Identifier-only filters are checked against the identifier column, so only
+        the matching segments are parsed. Segments already parsed are checked
+        directly, since their identifier may have been edited.
+        """
+        if len(filters) == 1 and filters[0][0] == 0:
+            matcher = filters[0][1]
+            indexes = set(_fast.match_indexes(self.identifiers, matcher))
+            for idx, segment in self.parsed.items():
+                if matcher(segment[0]):
+                    indexes.add(idx)
+                else:
+                    indexes.discard(idx)
+            return [(idx, self.parse(idx)) for idx in sorted(indexes)]
+        segments = ((idx, self.parse(idx)) for idx in range(len(self)))
+        return [
+            (idx, segment)
+            for idx, segment in segments
+            if _fast.matches(segment, filters)
+        ]
+
+    def materialize(self) -> list[X12Segment]:
+        """
+        Returns all segments, parsing any not yet accessed.
+        """
+        split = self._split
+        parsed = self.parsed
+        if not parsed:
+            return [split(raw) for raw in self.raw_segments]
+        return [
+            parsed[idx] if idx in parsed else split(raw)
+            for idx, raw in enumerate(self.raw_segments)
+        ]
+
+
+class _UnparsedStrSegments(_UnparsedSegments[str]):
+    """
+    Unparsed segments held as raw strings.
+    """
+
+    def _split_identifiers(self) -> list[str]:
+        return _fast.split_identifiers(self.raw_segments, self.element_separator)
+
+    def _split(self, raw: str) -> X12Segment:
+        return X12Segment(_fast.split_elements(raw, self.element_separator))
+
+
+class _UnparsedByteSegments(_UnparsedSegments[bytes]):
+    """
+    Unparsed segments held as raw ASCII bytes, decoded only when parsed.
+    """
+
+    def _split_identifiers(self) -> list[str]:
+        element_separator = self.element_separator.encode("ascii")
+        return _fast.split_identifiers_bytes(self.raw_segments, element_separator)
+
+    def _split(self, raw: bytes) -> X12Segment:
+        content = raw.decode("ascii")
+        return X12Segment(_fast.split_elements(content, self.element_separator))